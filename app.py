@@ -1,9 +1,15 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, send_file, flash
+import csv
+import hashlib
+from itertools import groupby
+from operator import itemgetter
+from functools import lru_cache
+from flask import Flask, render_template, request, redirect, url_for, send_file, flash, make_response, session
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
-from database.models import db, Student, Attempt, Recommendation, MentorPairing, User
+from database.models import db, enable_sqlite_pragmas, Student, Attempt, Recommendation, MentorPairing, User, StudentSummary
+from sqlalchemy import func, case, insert, delete, select, inspect, text
 import pandas as pd
 
 # Import new modular engines
@@ -15,7 +21,7 @@ from ml_engine.progress_tracker import ProgressTracker
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production' # Required for session
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///performance.db' # Changed to performance.db match requirements
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///performance.db') # Changed to performance.db match requirements
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
@@ -47,9 +53,143 @@ def create_default_admin():
         db.session.commit()
         print("Default Admin Created.")
 
+# Built once; SQLAlchemy reuses the compiled statements for every refresh
+SUMMARY_COLUMNS = [column.name for column in StudentSummary.__table__.columns if column.name not in ('id', 'updated_at')]
+INSERT_SUMMARY = insert(StudentSummary)
+CLEAR_SUMMARY = delete(StudentSummary)
+
+def frame_records(df):
+    """DataFrame rows as dicts with NaN/NaT turned into None for the database."""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+def refresh_summary_table(analyzed_df):
+    """
+    Rewrites the materialized student_summary table from the final analysis
+    in a single bulk insert.
+    """
+    records = frame_records(analyzed_df.reindex(columns=SUMMARY_COLUMNS))
+    
+    db.session.execute(CLEAR_SUMMARY)
+    if records:
+        db.session.execute(INSERT_SUMMARY, records)
+    db.session.commit()
+
+# Cleaned upload column -> Attempt column
+ATTEMPT_COLUMNS = {
+    'course_id': 'course_id',
+    'course_name': 'course_name',
+    'attempt_id': 'attempt_number',
+    'attempt_timestamp': 'attempt_date',
+    'score': 'mark',
+    'max_score': 'max_score',
+    'grade': 'grade',
+    'feedback': 'feedback',
+    'topic_tags': 'topic_tags'
+}
+ATTEMPT_FRAME_COLUMNS = ['student_id', 'name', 'email', *ATTEMPT_COLUMNS]
+# Attempt history labelled the way DataProcessor names the upload columns
+ATTEMPT_HISTORY = select(
+    Student.student_code.label('student_id'),
+    Student.name,
+    Student.email,
+    *(getattr(Attempt, column).label(name) for name, column in ATTEMPT_COLUMNS.items())
+).join(Student, Attempt.student_id == Student.id).order_by(Attempt.id)
+
+def store_attempts(detailed_df):
+    """
+    Replaces the Student/Attempt tables with the attempts of a processed upload,
+    one bulk insert per table.
+    """
+    df = detailed_df.reindex(columns=ATTEMPT_FRAME_COLUMNS)
+    df = df[df['email'].notna()]
+    df['attempt_timestamp'] = pd.to_datetime(df['attempt_timestamp'], errors='coerce')
+    
+    students = df.drop_duplicates('email')[['email', 'name', 'student_id']].rename(columns={'student_id': 'student_code'})
+    students['name'] = students['name'].fillna(students['email'])
+    
+    # Recommendations/pairings rows are keyed to the students being replaced
+    for model in (Attempt, Recommendation, MentorPairing, Student):
+        db.session.execute(delete(model))
+    if not students.empty:
+        db.session.execute(insert(Student), frame_records(students))
+        student_ids = dict(db.session.execute(select(Student.email, Student.id)).all())
+        attempts = df.rename(columns=ATTEMPT_COLUMNS).assign(student_id=df['email'].map(student_ids))
+        db.session.execute(insert(Attempt), frame_records(attempts[['student_id', *ATTEMPT_COLUMNS.values()]]))
+    db.session.commit()
+
+def load_attempts(email=None):
+    """
+    Attempt history (optionally of one student) as a DataFrame shaped like the
+    cleaned upload. Columns the upload never provided are left out.
+    """
+    statement = ATTEMPT_HISTORY if email is None else ATTEMPT_HISTORY.where(Student.email == email)
+    # Same dtypes DataProcessor.clean_data gives an upload, so refreshes aggregate identically
+    df = pd.read_sql(statement, db.session.connection(), dtype={'score': 'float32', 'max_score': 'float32'})
+    if df.empty:
+        return df
+    return df.loc[:, df.notna().any()]
+
+PAIRINGS_FILE = 'mentor_pairings.csv'
+_pairings_cache = {'key': None, 'records': [], 'by_course': {}}
+
+def load_pairings():
+    """
+    Returns (records, pairings_by_course) for mentor_pairings.csv.
+    The parsed file is kept in-process and only re-read when its mtime/size changes.
+    """
+    if not os.path.exists(PAIRINGS_FILE):
+        # Reset the key too, since the dashboard ETag is built from it
+        _pairings_cache.update(key=None, records=[], by_course={})
+        return [], {}
+    stat = os.stat(PAIRINGS_FILE)
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _pairings_cache['key'] != key:
+        # Plain rows of strings; the templates only render them
+        with open(PAIRINGS_FILE, newline='') as f:
+            reader = csv.DictReader(f)
+            records = list(reader)
+        pairings_by_course = {}
+        if records and 'course' in reader.fieldnames:
+            # Group by course (sorted, rows without a course left out)
+            by_course = sorted((record for record in records if record['course']), key=itemgetter('course'))
+            for course, group in groupby(by_course, key=itemgetter('course')):
+                pairings_by_course[course] = list(group)
+        elif records:
+             # Fallback if no course column, put all in 'General'
+             pairings_by_course['General'] = records
+        _pairings_cache.update(key=key, records=records, by_course=pairings_by_course)
+    return _pairings_cache['records'], _pairings_cache['by_course']
+
 with app.app_context():
+    enable_sqlite_pragmas(db.engine)
     db.create_all()
+    # Bring Student/Attempt tables left by an older schema up to date without losing
+    # rows: empty ones are recreated, populated ones get the missing columns (as NULL)
+    inspector = inspect(db.engine)
+    for model in (Attempt, Student):
+        table = model.__table__
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        if not missing:
+            continue
+        with db.engine.begin() as connection:
+            if connection.execute(select(func.count()).select_from(table)).scalar() == 0:
+                table.drop(connection)
+                table.create(connection)
+            else:
+                for column in missing:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(connection.dialect)}'))
+    # create_all skips existing tables, so add any indexes an older database is missing
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
     create_default_admin()
+    # Back-fill the summary table from an analysis produced before it existed
+    if os.path.exists('final_student_analysis.csv') and StudentSummary.query.first() is None:
+        refresh_summary_table(pd.read_csv('final_student_analysis.csv', usecols=lambda column: column in SUMMARY_COLUMNS))
+    # Likewise seed the attempt history from the detailed CSV
+    if os.path.exists('detailed_student_analysis.csv') and Attempt.query.first() is None:
+        store_attempts(pd.read_csv('detailed_student_analysis.csv', usecols=lambda column: column in ATTEMPT_FRAME_COLUMNS))
 
 @app.route('/')
 def index():
@@ -109,16 +249,17 @@ def upload_file():
             
             # Run Performance Analysis
             if 'performance' not in analyzed_df.columns:
-                 analyzed_df['performance'] = analyzed_df['best_score'].apply(performance_analyzer.classify_performance)
+                 analyzed_df['performance'] = performance_analyzer.classify_performance_batch(analyzed_df['best_score'])
 
             # Generate Recommendations
-            analyzed_df['recommended_action'] = analyzed_df.apply(course_recommender.recommend_courses, axis=1)
+            analyzed_df['recommended_action'] = course_recommender.recommend_courses_vectorized(analyzed_df)
             
             analyzed_df.to_csv('final_student_analysis.csv', index=False)
+            refresh_summary_table(analyzed_df)
             
-            # --- DATABASE PERSISTENCE (Partial Integration to meet ANAR requirements) ---
-            # Ideally we iterate and save to DB here. For now keeping CSV flow as primary viewer
-            # but ensuring User logic works.
+            # --- DATABASE PERSISTENCE ---
+            # The uploaded attempts become the source of truth for edits and history
+            store_attempts(data_processor.detailed_data)
             
             # Handle Pairings using MentorMatcher
             if pairings_file and pairings_file.filename != '':
@@ -138,85 +279,109 @@ def upload_file():
                 if 'mentor' in cols: rename_map['mentor'] = 'mentor_name'
                 
                 pairings_df.rename(columns=rename_map, inplace=True)
-                pairings_df.to_csv('mentor_pairings.csv', index=False)
+                pairings_df.to_csv(PAIRINGS_FILE, index=False)
             else:
                 pairings = mentor_matcher.match_mentors_simple(analyzed_df)
-                pairings.to_csv('mentor_pairings.csv', index=False)
+                pairings.to_csv(PAIRINGS_FILE, index=False)
             
             return redirect(url_for('dashboard'))
             
         except Exception as e:
             return f"An error occurred: {e}"
 
+# ORM-free summary rows, safe to keep across requests in the dashboard cache
+SUMMARY_ROW = StudentSummary.__table__.columns
+
+@lru_cache(maxsize=4)
+def dashboard_payload(watermark):
+    """
+    Dashboard aggregates from the materialized summary table, cached per
+    summary watermark (row count, last refresh time).
+    All queries below run in the session's single read transaction.
+    """
+    # Calculate Stats for Chart; the same grouped scan yields the total row count
+    performance_counts = dict(
+        db.session.query(StudentSummary.performance, func.count())
+        .group_by(StudentSummary.performance).all()
+    )
+    total_students = sum(performance_counts.values())
+    if not total_students:
+        return {
+            'students': [],
+            'total_students': 0,
+            'high_performers': 0,
+            'medium_performers': 0,
+            'poor_performers': 0,
+            'course_dist': {},
+            'avg_score_course': {},
+            'top_performers': [],
+            'bottom_performers': [],
+            'course_analytics': []
+        }
+    
+    students = db.session.query(*SUMMARY_ROW).limit(100).all()
+    
+    # Per-course aggregates in a single grouped query (assuming 50 is pass)
+    course_stats = db.session.query(
+        StudentSummary.course_name,
+        func.count(),
+        func.avg(StudentSummary.best_score),
+        func.avg(case((StudentSummary.best_score >= 50, 100.0), else_=0.0))
+    ).group_by(StudentSummary.course_name).order_by(StudentSummary.course_name).all()
+    
+    # Top 5 and Bottom 5 Performers
+    scored = db.session.query(*SUMMARY_ROW).filter(StudentSummary.best_score.isnot(None))
+    top_performers = scored.order_by(StudentSummary.best_score.desc(), StudentSummary.id).limit(5).all()
+    bottom_performers = scored.order_by(StudentSummary.best_score, StudentSummary.id).limit(5).all()
+    
+    # Course Analytics Grid Data
+    course_analytics = []
+    for course, _, avg, pass_rate in course_stats:
+        course_analytics.append({
+            'name': course,
+            'avg_score': round(avg, 1),
+            'pass_rate': round(pass_rate, 1),
+            'difficulty': 'High' if avg < 60 else ('Medium' if avg < 80 else 'Low')
+        })
+    
+    return {
+        'students': students,
+        'total_students': total_students,
+        'high_performers': performance_counts.get('High', 0),
+        'medium_performers': performance_counts.get('Medium', 0),
+        'poor_performers': performance_counts.get('Poor', 0),
+        # Additional Stats for new Graphs
+        'course_dist': {course: count for course, count, _, _ in course_stats},
+        'avg_score_course': {course: avg for course, _, avg, _ in course_stats},
+        'top_performers': top_performers,
+        'bottom_performers': bottom_performers,
+        'course_analytics': course_analytics
+    }
+
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    # Load data for display
+    # Load data for display (aggregates come from the materialized summary table).
     try:
-        if os.path.exists('final_student_analysis.csv'):
-            df = pd.read_csv('final_student_analysis.csv')
-            students = df.head(100).to_dict('records')
-            
-            # Calculate Stats for Chart
-            total_students = len(df)
-            performance_counts = df['performance'].value_counts()
-            high_performers = performance_counts.get('High', 0)
-            medium_performers = performance_counts.get('Medium', 0)
-            poor_performers = performance_counts.get('Poor', 0)
-            
-            # Additional Stats for new Graphs
-            course_dist = df['course_name'].value_counts().to_dict()
-            avg_score_course = df.groupby('course_name')['best_score'].mean().to_dict()
-            
-            # Top 5 and Bottom 5 Performers
-            top_performers = df.nlargest(5, 'best_score').to_dict('records')
-            bottom_performers = df.nsmallest(5, 'best_score').to_dict('records')
-            
-            # Course Analytics Grid Data
-            course_analytics = []
-            for course, group in df.groupby('course_name'):
-                avg = group['best_score'].mean()
-                pass_count = group[group['best_score'] >= 50].shape[0] # Assuming 50 is pass
-                total = group.shape[0]
-                pass_rate = (pass_count / total * 100) if total > 0 else 0
-                difficulty = 'High' if avg < 60 else ('Medium' if avg < 80 else 'Low')
-                course_analytics.append({
-                    'name': course,
-                    'avg_score': round(avg, 1),
-                    'pass_rate': round(pass_rate, 1),
-                    'difficulty': difficulty
-                })
-            
-        else:
-            students = []
-            total_students = 0
-            high_performers = 0
-            medium_performers = 0
-            poor_performers = 0
-            course_dist = {}
-            avg_score_course = {}
-            top_performers = []
-            bottom_performers = []
-            course_analytics = []
-            
-        if os.path.exists('mentor_pairings.csv'):
-            pairings = pd.read_csv('mentor_pairings.csv').to_dict('records')
-        else:
-            pairings = []
-            
-        return render_template('dashboard.html', 
-                               students=students, 
-                               pairings=pairings,
-                               total_students=total_students,
-                               high_performers=high_performers,
-                               medium_performers=medium_performers,
-                               poor_performers=poor_performers,
-                               course_dist=course_dist,
-                               avg_score_course=avg_score_course,
-                               top_performers=top_performers,
-                               bottom_performers=bottom_performers,
-                               course_analytics=course_analytics,
-                               user=current_user)
+        # Every refresh rewrites all summary rows, so count + latest updated_at
+        # changes whenever the analysis does
+        watermark = tuple(db.session.query(func.count(StudentSummary.id), func.max(StudentSummary.updated_at)).one())
+        payload = dashboard_payload(watermark)
+        pairings, _ = load_pairings()
+        # The layout renders (and so consumes) pending flash messages
+        has_flashes = '_flashes' in session
+        
+        response = make_response(render_template('dashboard.html', 
+                                                 pairings=pairings,
+                                                 user=current_user,
+                                                 **payload))
+        # Let the browser revalidate instead of re-downloading an unchanged page;
+        # a page showing flash messages is always sent in full
+        if not has_flashes:
+            response.set_etag(hashlib.md5(repr((watermark, _pairings_cache['key'], current_user.id)).encode()).hexdigest())
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response = response.make_conditional(request)
+        return response
     except Exception as e:
          return f"Error loading dashboard: {e}"
 
@@ -224,17 +389,17 @@ def dashboard():
 @login_required
 def view_feedback():
     feedback_by_course = {}
-    if os.path.exists('final_student_analysis.csv'):
-        df = pd.read_csv('final_student_analysis.csv')
-        # Check which column holds the course identifier
-        course_col = 'course_name' if 'course_name' in df.columns else ('course' if 'course' in df.columns else None)
-        
-        if course_col:
-            for course, group in df.groupby(course_col):
-                feedback_by_course[course] = group.to_dict('records')
-        else:
-             # Fallback
-             feedback_by_course['General'] = df.to_dict('records')
+    # Only the columns the feedback page renders, straight from the summary table
+    rows = db.session.query(
+        StudentSummary.name,
+        StudentSummary.email,
+        StudentSummary.course_name,
+        StudentSummary.feedback
+    ).order_by(StudentSummary.course_name, StudentSummary.id).all()
+    
+    for row in rows:
+        # Fallback if no course column, put all in 'General'
+        feedback_by_course.setdefault(row.course_name or 'General', []).append(row)
     
     return render_template('feedback.html', feedback_by_course=feedback_by_course)
 
@@ -247,64 +412,46 @@ def student_analysis(email):
     recommendations = ['Advanced Stats']
     attempts = [{'course': 'Python', 'score': 80, 'grade': 'A', 'attempt': 1}]
     
-    # Try to find meaningful data from CSV if exists
-    if os.path.exists('final_student_analysis.csv'):
-        df = pd.read_csv('final_student_analysis.csv')
-        row = df[df['email'] == email]
-        if not row.empty:
-            r = row.iloc[0]
-            student = {
-                'name': r['name'], 
-                'email': r['email'], 
-                'performance_category': r['performance']
-            }
-            # Mock parsing strengths from a column if it existed
-            analysis = {'strengths': [], 'weaknesses': []} 
-            recommendations = [r.get('recommended_action', 'None')]
+    # Try to find meaningful data in the summary table (explicit columns only)
+    r = db.session.query(
+        StudentSummary.name,
+        StudentSummary.email,
+        StudentSummary.performance,
+        StudentSummary.recommended_action
+    ).filter(StudentSummary.email == email).order_by(StudentSummary.id).first()
+    if r:
+        student = {
+            'name': r.name, 
+            'email': r.email, 
+            'performance_category': r.performance
+        }
+        # Mock parsing strengths from a column if it existed
+        analysis = {'strengths': [], 'weaknesses': []} 
+        recommendations = [r.recommended_action or 'None']
 
     # Get Detailed History & Analyze Strengths/Weaknesses
-    if os.path.exists('detailed_student_analysis.csv'):
-        detailed_df = pd.read_csv('detailed_student_analysis.csv')
-        student_history = detailed_df[detailed_df['email'] == email]
-        
-        if not student_history.empty:
-            # Sort by entry if meaningful, else just use index
-            attempts = student_history.to_dict('records')
-            
-            # Normalize keys for template (ensure 'score' exists)
-            for i, attempt in enumerate(attempts):
-                if 'score' not in attempt:
-                    # Fallbacks based on common column names
-                    attempt['score'] = attempt.get('mark', attempt.get('best_score', 0))
+    student_history = load_attempts(email)
+    if not student_history.empty:
+        # History always carries 'score'; number the attempts for the template
+        # Sort by entry if meaningful, else just use index
+        attempts = student_history.assign(attempt=range(1, len(student_history) + 1)).to_dict('records')
                 
-                if 'attempt' not in attempt:
-                    attempt['attempt'] = i + 1
-                    
-            # Real AI Analysis
-            analysis = performance_analyzer.analyze_strengths_weaknesses(student_history)
-            
-            # Recommendation Engine
-            if analysis['weaknesses']:
-                recommendations = course_recommender.recommend_from_weaknesses(analysis['weaknesses'])
-            else:
-                 recommendations = ["Keep maintaining your high performance!", "Mentor peers in your strong subjects."]
+        # Real AI Analysis
+        analysis = performance_analyzer.analyze_strengths_weaknesses(student_history)
+        
+        # Recommendation Engine
+        if analysis['weaknesses']:
+            recommendations = course_recommender.recommend_from_weaknesses(analysis['weaknesses'])
+        else:
+             recommendations = ["Keep maintaining your high performance!", "Mentor peers in your strong subjects."]
 
-                    
+                
     return render_template('analysis.html', student=student, analysis=analysis, recommendations=recommendations, attempts=attempts)
 
 @app.route('/pairings')
 @login_required
 def view_pairings():
-    pairings_by_course = {}
-    if os.path.exists('mentor_pairings.csv'):
-        df = pd.read_csv('mentor_pairings.csv')
-        if not df.empty and 'course' in df.columns:
-            # Group by course
-            for course, group in df.groupby('course'):
-                pairings_by_course[course] = group.to_dict('records')
-        elif not df.empty:
-             # Fallback if no course column, put all in 'General'
-             pairings_by_course['General'] = df.to_dict('records')
+    _, pairings_by_course = load_pairings()
     
     return render_template('pairing.html', pairings_by_course=pairings_by_course)
     
@@ -317,28 +464,45 @@ def download_report():
 
 def refresh_analysis():
     """
-    Helper to re-process detailed data and update final analysis CSV.
+    Helper to re-aggregate the stored attempts and update the final analysis.
     Ensures dashboard consistency after CRUD operations.
     """
     try:
-        if os.path.exists('detailed_student_analysis.csv'):
-            # Process the updated detailed file to regenerate summary
-            analyzed_df = data_processor.process_student_data('detailed_student_analysis.csv')
+        attempts_df = load_attempts()
+        if not attempts_df.empty:
+            # Aggregate the updated attempt history to regenerate summary
+            analyzed_df = data_processor.summarize_attempts(attempts_df)
             
             # Run Performance Analysis
             if 'performance' not in analyzed_df.columns:
-                 analyzed_df['performance'] = analyzed_df['best_score'].apply(performance_analyzer.classify_performance)
+                 analyzed_df['performance'] = performance_analyzer.classify_performance_batch(analyzed_df['best_score'])
 
             # Generate Recommendations
-            analyzed_df['recommended_action'] = analyzed_df.apply(course_recommender.recommend_courses, axis=1)
+            analyzed_df['recommended_action'] = course_recommender.recommend_courses_vectorized(analyzed_df)
+        else:
+            analyzed_df = pd.DataFrame(columns=SUMMARY_COLUMNS)
             
-            # Save Updated Final Analysis
-            analyzed_df.to_csv('final_student_analysis.csv', index=False)
-            return True
+        # Save Updated Final Analysis
+        analyzed_df.to_csv('final_student_analysis.csv', index=False)
+        refresh_summary_table(analyzed_df)
+        return True
     except Exception as e:
         print(f"Error refreshing analysis: {e}")
         return False
 
+def student_id_of(email):
+    """Subquery selecting the Student id behind an email."""
+    return select(Student.id).where(Student.email == email).scalar_subquery()
+
+def latest_attempt_id(email):
+    """
+    Subquery selecting a student's most recent attempt. Undated attempts count as
+    newest, as on the student page (NaT sorts last there).
+    """
+    return (select(Attempt.id).where(Attempt.student_id == student_id_of(email))
+            .order_by(Attempt.attempt_date.is_(None).desc(), Attempt.attempt_date.desc(), Attempt.id.desc())
+            .limit(1).scalar_subquery())
+
 @app.route('/add_student', methods=['GET', 'POST'])
 @login_required
 def add_student():
@@ -355,15 +519,23 @@ def add_student():
                 'topic_tags': request.form.get('topic_tags', '')
             }
             
-            # Load existing detailed data or create new
-            if os.path.exists('detailed_student_analysis.csv'):
-                df = pd.read_csv('detailed_student_analysis.csv')
-            else:
-                df = pd.DataFrame(columns=new_data.keys())
+            # Append the attempt, creating the student on first sight
+            student = Student.query.filter_by(email=new_data['email']).first()
+            if student is None:
+                student = Student(email=new_data['email'], name=new_data['name'])
+                db.session.add(student)
+                db.session.flush()
             
-            # Append new record
-            df = pd.concat([df, pd.DataFrame([new_data])], ignore_index=True)
-            df.to_csv('detailed_student_analysis.csv', index=False)
+            attempt_date = pd.to_datetime(new_data['attempt_timestamp'], errors='coerce')
+            db.session.add(Attempt(
+                student_id=student.id,
+                course_name=new_data['course_name'],
+                mark=new_data['score'],
+                attempt_date=None if pd.isna(attempt_date) else attempt_date.to_pydatetime(),
+                feedback=new_data['feedback'],
+                topic_tags=new_data['topic_tags']
+            ))
+            db.session.commit()
             
             # Trigger Refresh
             refresh_analysis()
@@ -372,6 +544,7 @@ def add_student():
             return redirect(url_for('dashboard'))
             
         except Exception as e:
+            db.session.rollback()
             flash(f"Error adding student: {str(e)}", 'danger')
             return redirect(url_for('add_student'))
             
@@ -385,25 +558,11 @@ def edit_student(email):
             name = request.form.get('name')
             score = float(request.form.get('score'))
             
-            if os.path.exists('detailed_student_analysis.csv'):
-                df = pd.read_csv('detailed_student_analysis.csv')
-                
-                # 1. Update Name for ALL records of this student
-                df.loc[df['email'] == email, 'name'] = name
-                
+            # 1. Update Name for ALL records of this student
+            if Student.query.filter_by(email=email).update({'name': name}):
                 # 2. Update Score for the LATEST record
-                student_rows = df[df['email'] == email]
-                if not student_rows.empty:
-                    # Identify latest by timestamp or index
-                    if 'attempt_timestamp' in df.columns:
-                        df['attempt_timestamp'] = pd.to_datetime(df['attempt_timestamp'], errors='coerce')
-                        latest_idx = df[df['email'] == email].sort_values('attempt_timestamp').index[-1]
-                    else:
-                        latest_idx = student_rows.index[-1]
-                        
-                    df.at[latest_idx, 'score'] = score
-                
-                df.to_csv('detailed_student_analysis.csv', index=False)
+                Attempt.query.filter(Attempt.id == latest_attempt_id(email)).update({'mark': score}, synchronize_session=False)
+                db.session.commit()
                 refresh_analysis()
                 
                 flash(f"Student record updated successfully.", 'success')
@@ -412,31 +571,24 @@ def edit_student(email):
                  flash("No data found to edit.", 'warning')
 
         except Exception as e:
+            db.session.rollback()
             flash(f"Error editing student: {str(e)}", 'danger')
             
     # GET Request: Populate Form
     student = {'email': email, 'name': '', 'latest_score': 0}
     latest_attempt = {}
     
-    if os.path.exists('detailed_student_analysis.csv'):
-        df = pd.read_csv('detailed_student_analysis.csv')
-        student_rows = df[df['email'] == email]
+    name = db.session.query(Student.name).filter_by(email=email).scalar()
+    if name is not None:
+        student['name'] = name
         
-        if not student_rows.empty:
-            # Get Name from first row
-            student['name'] = student_rows.iloc[0]['name']
-            
-            # Get Latest Attempt
-            if 'attempt_timestamp' in df.columns:
-                df['attempt_timestamp'] = pd.to_datetime(df['attempt_timestamp'], errors='coerce')
-                latest_row = student_rows.sort_values('attempt_timestamp').iloc[-1]
-            else:
-                latest_row = student_rows.iloc[-1]
-            
+        # Get Latest Attempt
+        latest_row = Attempt.query.filter(Attempt.id == latest_attempt_id(email)).first()
+        if latest_row is not None:
             latest_attempt = {
-                'course_name': latest_row.get('course_name', 'Unknown'),
-                'score': latest_row.get('score', 0),
-                'attempt_timestamp': latest_row.get('attempt_timestamp', 'Unknown')
+                'course_name': latest_row.course_name or 'Unknown',
+                'score': latest_row.mark,
+                'attempt_timestamp': latest_row.attempt_date or 'Unknown'
             }
 
     return render_template('edit_student.html', student=student, latest_attempt=latest_attempt)
@@ -445,13 +597,12 @@ def edit_student(email):
 @login_required
 def delete_student(email):
     try:
-        # Update Detailed History (Source of Truth)
-        if os.path.exists('detailed_student_analysis.csv'):
-            detailed_df = pd.read_csv('detailed_student_analysis.csv')
-            detailed_df = detailed_df[detailed_df['email'] != email]
-            detailed_df.to_csv('detailed_student_analysis.csv', index=False)
+        # Update Attempt History (Source of Truth)
+        Attempt.query.filter(Attempt.student_id == student_id_of(email)).delete(synchronize_session=False)
+        if Student.query.filter_by(email=email).delete():
+            db.session.commit()
             
-            # Refresh Final Summary based on new detailed data
+            # Refresh Final Summary based on new attempt data
             refresh_analysis()
             
             flash(f'Student {email} deleted successfully.', 'success')
@@ -459,6 +610,7 @@ def delete_student(email):
             flash('No data found to delete.', 'warning')
             
     except Exception as e:
+        db.session.rollback()
         flash(f'Error deleting student: {str(e)}', 'danger')
         
     return redirect(url_for('dashboard'))
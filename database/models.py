@@ -1,9 +1,35 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from flask_login import UserMixin
+from sqlalchemy import event
 
 db = SQLAlchemy()
 
+_wal_enabled = False
+
+def enable_sqlite_pragmas(engine):
+    """
+    Tunes every new SQLite connection: WAL journal, NORMAL sync, in-memory temp
+    storage, 64 MB page cache and memory-mapped reads.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        global _wal_enabled
+        cursor = dbapi_connection.cursor()
+        # journal_mode is persisted in the database file, so it only needs setting once
+        if not _wal_enabled:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            _wal_enabled = True
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-65536')
+        cursor.execute('PRAGMA mmap_size=268435456')
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -14,22 +40,30 @@ class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
+    student_code = db.Column(db.String(20))  # student_id from the uploaded sheet, e.g. S001
     performance_category = db.Column(db.String(20))  # Poor/Medium/High
     registration_date = db.Column(db.DateTime, default=datetime.utcnow)
     
 class Attempt(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
-    course_id = db.Column(db.String(50)) 
+    course_id = db.Column(db.String(50), index=True)
     course_name = db.Column(db.String(200))
     mark = db.Column(db.Float, nullable=False)
+    max_score = db.Column(db.Float)
     grade = db.Column(db.String(2))
     attempt_number = db.Column(db.Integer, default=1)
-    attempt_date = db.Column(db.DateTime, default=datetime.utcnow)
+    attempt_date = db.Column(db.DateTime)  # NULL when the upload gave no (valid) timestamp
+    feedback = db.Column(db.Text)
+    topic_tags = db.Column(db.String(200))
+
+    # Leading student_id column also serves plain per-student lookups;
+    # covers the per student/course mark aggregations without touching the table
+    __table_args__ = (db.Index('ix_attempt_student_course_mark', 'student_id', 'course_name', 'mark'),)
     
 class Recommendation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, index=True)
     course_list = db.Column(db.Text)  # JSON string of courses
     priority_level = db.Column(db.String(10)) 
     assigned_mentor = db.Column(db.Integer, db.ForeignKey('student.id'))
@@ -38,7 +72,29 @@ class Recommendation(db.Model):
 
 class MentorPairing(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    mentor_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
-    mentee_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    mentor_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, index=True)
+    mentee_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, index=True)
     course_name = db.Column(db.String(200), nullable=False)
     pairing_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+class StudentSummary(db.Model):
+    # Materialized final analysis (one row per student per course), rewritten on
+    # every upload/refresh so dashboard reads never re-aggregate the CSV.
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.String(20))
+    email = db.Column(db.String(120), index=True)
+    name = db.Column(db.String(100))
+    course_name = db.Column(db.String(200))
+    best_score = db.Column(db.Float, index=True)
+    average_score = db.Column(db.Float)
+    std_score = db.Column(db.Float)
+    latest_score = db.Column(db.Float)
+    attempts = db.Column(db.Integer)
+    performance = db.Column(db.String(20), index=True)  # Poor/Medium/High
+    recommended_action = db.Column(db.String(200))
+    feedback = db.Column(db.Text)
+    topic_tags = db.Column(db.String(200))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Covers the per-course count/avg/pass-rate aggregation on the dashboard
+    __table_args__ = (db.Index('ix_student_summary_course_best', 'course_name', 'best_score'),)
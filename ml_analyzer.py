@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 
+from ml_engine.mentor_matcher import MentorMatcher
+from ml_engine.recommender import CourseRecommender
+
 def load_processed_data(filepath='processed_student_data.csv'):
     """
     Load the processed student data.
@@ -23,50 +26,19 @@ def recommend_courses(row):
     else:
         return "Mentorship Program (Become a Mentor)"
 
+def recommend_courses_vectorized(df):
+    """
+    recommend_courses over the whole frame in one pass (no per-row apply).
+    Uses the vectorized rule from CourseRecommender.
+    """
+    return CourseRecommender().recommend_courses_vectorized(df)
+
 def match_mentors(df):
     """
     Pair 'Poor' performers with 'High' performers in the same course.
+    Uses the vectorized rank alignment from MentorMatcher (no per-course loop).
     """
-    pairings = []
-    
-    # Group by Course
-    courses = df['course_name'].unique()
-    
-    for course in courses:
-        course_df = df[df['course_name'] == course]
-        
-        # Separate potential mentors and mentees
-        mentors = course_df[course_df['performance'] == 'High']
-        mentees = course_df[course_df['performance'] == 'Poor']
-        
-        # Simple pairing logic: First available mentor for each mentee
-        mentors_list = mentors.to_dict('records')
-        mentees_list = mentees.to_dict('records')
-        
-        min_len = min(len(mentors_list), len(mentees_list))
-        
-        for i in range(min_len):
-            pairing = {
-                'course': course,
-                'mentor_name': mentors_list[i]['name'],
-                'mentor_email': mentors_list[i].get('email', 'N/A'),
-                'mentee_name': mentees_list[i]['name'],
-                'mentee_email': mentees_list[i].get('email', 'N/A')
-            }
-            pairings.append(pairing)
-            
-        # Handle unmatched
-        if len(mentees_list) > len(mentors_list):
-            for i in range(len(mentors_list), len(mentees_list)):
-                 pairings.append({
-                    'course': course,
-                    'mentor_name': 'Unassigned (Waitlist)',
-                    'mentor_email': 'N/A',
-                    'mentee_name': mentees_list[i]['name'],
-                    'mentee_email': mentees_list[i].get('email', 'N/A')
-                })
-                
-    return pd.DataFrame(pairings)
+    return MentorMatcher().match_mentors_simple(df)
 
 def main():
     print("Loading processed data...")
@@ -75,7 +47,7 @@ def main():
     if df is not None:
         # 1. Generate Recommendations
         print("Generating Course Recommendations...")
-        df['recommended_action'] = df.apply(recommend_courses, axis=1)
+        df['recommended_action'] = recommend_courses_vectorized(df)
         
         print("\n--- Student Recommendations Sample ---")
         print(df[['name', 'course_name', 'performance', 'recommended_action']].head())
@@ -1,18 +1,57 @@
 import pandas as pd
 import numpy as np
 import os
+import hashlib
+
+from ml_engine.schema import resolve_rename_map
+
+# CSV uploads above this size are parsed in chunks of CHUNK_ROWS rows
+LARGE_UPLOAD_BYTES = 50 * 1024 * 1024
+CHUNK_ROWS = 100_000
+
+# Low-cardinality labels clean_data stores as categoricals
+CATEGORY_COLUMNS = ('course_id', 'course_name', 'grade')
+
+# Bump when the cleaning/aggregation output changes so cached results are not reused
+PIPELINE_VERSION = 1
+
+def file_fingerprint(path):
+    """
+    Content hash of a file, so byte-identical re-uploads can be recognised
+    regardless of their name or mtime.
+    """
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 class DataProcessor:
     def __init__(self):
         self.raw_data = None
+        self.detailed_data = None
         self.processed_data = None
+        # (key, summary_df) of the last processed upload; its detailed rows stay in detailed_data
+        self._result_cache = None
     
-    def load_data(self, file_path):
+    def load_data(self, file_path, chunksize=None):
         """
         Loads data from CSV or Excel file.
+        With chunksize, a CSV is read and cleaned chunk by chunk so the full
+        uncleaned file is never held in memory at once; the result is then
+        already cleaned.
         """
         if file_path.endswith('.csv'):
-            self.raw_data = pd.read_csv(file_path)
+            if chunksize:
+                chunks = pd.read_csv(file_path, chunksize=chunksize)
+                df = pd.concat((self.clean_data(chunk) for chunk in chunks), ignore_index=True)
+                # Chunks carry different category sets, which concat turns back into plain labels
+                for col in CATEGORY_COLUMNS:
+                    if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                        df[col] = df[col].astype('category')
+                self.raw_data = df
+            else:
+                self.raw_data = pd.read_csv(file_path)
         elif file_path.endswith(('.xls', '.xlsx')):
             self.raw_data = pd.read_excel(file_path)
         else:
@@ -27,40 +66,52 @@ class DataProcessor:
         # Standardize column names
         df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
         
-        # Mapping for Score
-        if 'mark' in df.columns:
-            df.rename(columns={'mark': 'score'}, inplace=True)
-        
-        # Mapping for Name
-        if 'candidate_name' in df.columns:
-            df.rename(columns={'candidate_name': 'name'}, inplace=True)
-        elif 'student_name' in df.columns:
-            df.rename(columns={'student_name': 'name'}, inplace=True)
-
-        # Mapping for Course
-        if 'course' in df.columns:
-            df.rename(columns={'course': 'course_name'}, inplace=True)
-        
-        # Mapping for Email
-        if 'candidate_email' in df.columns:
-            df.rename(columns={'candidate_email': 'email'}, inplace=True)
+        # Map Score/Name/Course/Email aliases onto the canonical names in one rename
+        df.rename(columns=resolve_rename_map(frozenset(df.columns)), inplace=True)
 
-        # Ensure numeric Score
+        # Ensure numeric Score (float32 is plenty for marks and halves the column size)
         if 'score' in df.columns:
-            df['score'] = pd.to_numeric(df['score'], errors='coerce')
-            df['score'].fillna(0, inplace=True)
+            df['score'] = pd.to_numeric(df['score'], errors='coerce').fillna(0).astype(np.float32)
+        if 'max_score' in df.columns:
+            df['max_score'] = pd.to_numeric(df['max_score'], errors='coerce').astype(np.float32)
+        # Numeric student ids fit a narrower integer type
+        if 'student_id' in df.columns and pd.api.types.is_integer_dtype(df['student_id']):
+            df['student_id'] = pd.to_numeric(df['student_id'], downcast='integer')
+        
+        # Low-cardinality labels
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
             
         return df
 
-    def process_student_data(self, file_path, feedback_file_path=None):
+    def process_student_data(self, file_path, feedback_file_path=None, save_detailed=False):
         """
         Main processing logic, including merging feedback and aggregating attempts.
+        Re-uploading byte-identical files returns the previous result without
+        reprocessing. The cleaned attempt rows are kept in self.detailed_data and
+        only written to detailed_student_analysis.csv when save_detailed is set.
         """
-        df = self.load_data(file_path)
-        df = self.clean_data(df)
+        has_feedback = bool(feedback_file_path) and os.path.exists(feedback_file_path)
+        cache_key = (PIPELINE_VERSION, file_fingerprint(file_path),
+                     file_fingerprint(feedback_file_path) if has_feedback else None)
+        if self._result_cache and self._result_cache[0] == cache_key:
+            # Callers add columns to the summary, so hand out a copy
+            self.processed_data = self._result_cache[1].copy()
+            if save_detailed:
+                self.save_detailed_data()
+            return self.processed_data
+
+        chunksize = None
+        if file_path.endswith('.csv') and os.path.getsize(file_path) > LARGE_UPLOAD_BYTES:
+            chunksize = CHUNK_ROWS
+        df = self.load_data(file_path, chunksize=chunksize)
+        if not chunksize:
+            # Chunked loads come back cleaned
+            df = self.clean_data(df)
         
         # Load Feedback if available
-        if feedback_file_path and os.path.exists(feedback_file_path):
+        if has_feedback:
             feedback_df = self.load_data(feedback_file_path)
             feedback_df = self.clean_data(feedback_df)
             
@@ -68,8 +119,27 @@ class DataProcessor:
             if 'student_id' in df.columns and 'student_id' in feedback_df.columns:
                 if 'feedback' in feedback_df.columns:
                     df = pd.merge(df, feedback_df[['student_id', 'feedback']], on='student_id', how='left')
-                    df['feedback'].fillna("No feedback available.", inplace=True)
+                    df['feedback'] = df['feedback'].fillna("No feedback available.")
         
+        summary_df = self.summarize_attempts(df)
+        
+        self._result_cache = (cache_key, summary_df.copy())
+        self.detailed_data = df
+        self.processed_data = summary_df
+        if save_detailed:
+            self.save_detailed_data()
+        return summary_df
+
+    def save_detailed_data(self, path='detailed_student_analysis.csv'):
+        """
+        Writes the cleaned attempt rows of the last processed upload to CSV.
+        """
+        self.detailed_data.to_csv(path, index=False)
+
+    def summarize_attempts(self, df):
+        """
+        Aggregates cleaned attempt rows into one summary row per student per course.
+        """
         # Aggregation Logic (Best Score logic)
         # Attempting to group by Student Identifier (Email preferred, else Name/ID)
         group_cols = []
@@ -86,36 +156,23 @@ class DataProcessor:
             df['attempt_timestamp'] = pd.to_datetime(df['attempt_timestamp'], errors='coerce')
             df.sort_values(by=['email', 'course_name', 'attempt_timestamp'], inplace=True)
 
-        agg_funcs = {'score': ['max', 'mean', 'count', 'std', 'last']}
-        
-        if 'feedback' in df.columns:
-            agg_funcs['feedback'] = 'first'
-        if 'topic_tags' in df.columns:
-            agg_funcs['topic_tags'] = 'first'
-            
-        summary_df = df.groupby(group_cols).agg(agg_funcs).reset_index()
-        
-        # Flatten columns
-        summary_df.columns = ['_'.join(col).strip() if col[1] else col[0] for col in summary_df.columns.values]
-        
-        # Renaissance
-        rename_map = {
-            'score_max': 'best_score',
-            'score_mean': 'average_score',
-            'score_count': 'attempts',
-            'score_std': 'std_score',
-            'score_last': 'latest_score',
-            'feedback_first': 'feedback',
-            'topic_tags_first': 'topic_tags'
+        # Named aggregation gives flat, final column names directly
+        aggregations = {
+            'best_score': ('score', 'max'),
+            'average_score': ('score', 'mean'),
+            'attempts': ('score', 'count'),
+            'std_score': ('score', 'std'),
+            'latest_score': ('score', 'last'),
         }
-        summary_df.rename(columns=rename_map, inplace=True)
+        for col in ('feedback', 'topic_tags'):
+            if col in df.columns:
+                aggregations[col] = (col, 'first')
+            
+        # observed=True: course_name is categorical, only real combinations are wanted
+        summary_df = df.groupby(group_cols, observed=True).agg(**aggregations).reset_index()
         
         # Fill NaN std (single attempts) with 0
         if 'std_score' in summary_df.columns:
-            summary_df['std_score'].fillna(0, inplace=True)
+            summary_df['std_score'] = summary_df['std_score'].fillna(0)
         
-        # Save detailed data for progress tracking
-        df.to_csv('detailed_student_analysis.csv', index=False)
-
-        self.processed_data = summary_df
         return summary_df
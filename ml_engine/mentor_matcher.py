@@ -1,5 +1,4 @@
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 class MentorMatcher:
@@ -9,35 +8,34 @@ class MentorMatcher:
     def match_mentors_simple(self, df):
         """
         Existing logic: Pair 'Poor' with 'High' in same course.
+        The n-th mentor of a course is paired with its n-th mentee in one merge;
+        mentees beyond the number of mentors are waitlisted.
         """
-        pairings = []
-        courses = df['course_name'].unique()
+        people = df.loc[df['course_name'].notna(), ['course_name', 'name', 'performance']]
+        people['email'] = df['email'] if 'email' in df.columns else 'N/A'
+        # Courses keep their order of first appearance, as in the per-course loop
+        people['course_order'] = pd.factorize(people['course_name'])[0]
         
-        for course in courses:
-            course_df = df[df['course_name'] == course]
-            mentors = course_df[course_df['performance'] == 'High'].to_dict('records')
-            mentees = course_df[course_df['performance'] == 'Poor'].to_dict('records')
-            
-            min_len = min(len(mentors), len(mentees))
-            
-            for i in range(min_len):
-                pairing = {
-                    'course': course,
-                    'mentor_name': mentors[i]['name'],
-                    'mentor_email': mentors[i].get('email', 'N/A'),
-                    'mentee_name': mentees[i]['name'],
-                    'mentee_email': mentees[i].get('email', 'N/A')
-                }
-                pairings.append(pairing)
-                
-            # Handle unmatched mentees
-            if len(mentees) > len(mentors):
-                for i in range(len(mentors), len(mentees)):
-                     pairings.append({
-                        'course': course,
-                        'mentor_name': 'Unassigned (Waitlist)',
-                        'mentor_email': 'N/A',
-                        'mentee_name': mentees[i]['name'],
-                        'mentee_email': mentees[i].get('email', 'N/A')
-                    })
-        return pd.DataFrame(pairings)
+        mentors = people[people['performance'] == 'High']
+        mentees = people[people['performance'] == 'Poor']
+        mentors = mentors.assign(rank=mentors.groupby('course_name', sort=False, observed=True).cumcount())
+        mentees = mentees.assign(rank=mentees.groupby('course_name', sort=False, observed=True).cumcount())
+        
+        pairs = mentees.merge(
+            mentors[['course_name', 'rank', 'name', 'email']],
+            on=['course_name', 'rank'], how='left', suffixes=('_mentee', '_mentor'), indicator=True
+        ).sort_values(['course_order', 'rank'], kind='stable')
+        
+        # Handle unmatched mentees
+        unmatched = pairs['_merge'] == 'left_only'
+        pairs.loc[unmatched, 'name_mentor'] = 'Unassigned (Waitlist)'
+        pairs.loc[unmatched, 'email_mentor'] = 'N/A'
+        
+        pairs = pairs.rename(columns={
+            'course_name': 'course',
+            'name_mentor': 'mentor_name',
+            'email_mentor': 'mentor_email',
+            'name_mentee': 'mentee_name',
+            'email_mentee': 'mentee_email'
+        })
+        return pairs[['course', 'mentor_name', 'mentor_email', 'mentee_name', 'mentee_email']].reset_index(drop=True)
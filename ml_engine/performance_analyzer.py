@@ -1,6 +1,8 @@
-    import pandas as pd
+import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
+
+# Low-cardinality, ordered labels stored as a categorical (int8 codes)
+PERFORMANCE_DTYPE = pd.CategoricalDtype(['Poor', 'Medium', 'High'], ordered=True)
 
 class PerformanceAnalyzer:
     def __init__(self):
@@ -17,17 +19,31 @@ class PerformanceAnalyzer:
         else:
             return 'High'
 
+    def classify_performance_batch(self, scores):
+        """
+        Vectorized classify_performance for a whole score column.
+        """
+        values = scores.to_numpy()
+        labels = np.select([values < 60, values <= 80], ['Poor', 'Medium'], default='High')
+        return pd.Series(labels, index=scores.index).astype(PERFORMANCE_DTYPE)
+
     def classify_students_kmeans(self, df, n_clusters=3):
         """
         Advanced: Uses K-Means clustering to classify students if enough data exists.
         Expects a dataframe with 'best_score' or 'average_score'.
         """
-        if len(df) < n_clusters:
-            # Fallback to rule-based if not enough data points
-             return df['best_score'].apply(self.classify_performance)
+        if len(df) < n_clusters or df['best_score'].nunique() < n_clusters:
+            # Fallback to rule-based if not enough (distinct) data points
+             return self.classify_performance_batch(df['best_score'])
              
+        # Imported here so app start-up does not pay for loading sklearn
+        from sklearn.cluster import KMeans
+        
         X = df[['best_score']].values
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+        # 1-D scores: seeding the centroids at the quantiles makes a single Lloyd run
+        # enough, instead of random k-means++ restarts
+        seeds = np.quantile(X, (np.arange(n_clusters) + 0.5) / n_clusters).reshape(-1, 1)
+        kmeans = KMeans(n_clusters=n_clusters, init=seeds, n_init=1, random_state=42)
         df['cluster'] = kmeans.fit_predict(X)
         
         # Map clusters to labels based on centroid limits
@@ -41,7 +57,7 @@ class PerformanceAnalyzer:
             sorted_idx[2]: 'High'
         }
         
-        return df['cluster'].map(cluster_map)
+        return df['cluster'].map(cluster_map).astype(PERFORMANCE_DTYPE)
 
     def analyze_strengths_weaknesses(self, student_history_df):
         """
@@ -51,13 +67,16 @@ class PerformanceAnalyzer:
         if student_history_df.empty or 'course_name' not in student_history_df.columns or 'score' not in student_history_df.columns:
             return {'strengths': [], 'weaknesses': []}
             
-        # Sort by timestamp if available to get true latest score
+        # Latest score per course: pick each course's newest attempt directly instead of
+        # sorting the whole history (undated attempts count as newest, as they sorted last).
+        # Scanning the rows in reverse makes idxmax break ties toward the later row, as sort + last did.
         if 'attempt_timestamp' in student_history_df.columns:
-            student_history_df['attempt_timestamp'] = pd.to_datetime(student_history_df['attempt_timestamp'], errors='coerce')
-            student_history_df = student_history_df.sort_values('attempt_timestamp')
-
-        # Get latest score per course
-        course_performance = student_history_df.groupby('course_name')['score'].last()
+            history = student_history_df.iloc[::-1]
+            timestamps = pd.to_datetime(history['attempt_timestamp'], errors='coerce').fillna(pd.Timestamp.max)
+            latest_idx = timestamps.groupby(history['course_name'], observed=True).idxmax()
+            course_performance = history.loc[latest_idx].set_index('course_name')['score']
+        else:
+            course_performance = student_history_df.groupby('course_name', observed=True)['score'].last()
         
         # Notebook Logic: >= 80 Strong, < 50 Weak (Recommendation trigger)
         strengths = course_performance[course_performance >= 80].index.tolist()
@@ -11,31 +11,23 @@ class ProgressTracker:
         Expects raw dataframe with 'student_id', 'course_name', 'score', 'attempt_id' (or similar).
         """
         # Ensure we have datetime or orderable attempt
-        if 'attempt_timestamp' in df.columns:
+        presorted = 'attempt_timestamp' in df.columns
+        if presorted:
             df['attempt_timestamp'] = pd.to_datetime(df['attempt_timestamp'])
             df.sort_values(by=['student_id', 'course_name', 'attempt_timestamp'], inplace=True)
         else:
             # Assume current order is chronological if no timestamp
             pass
 
-        # Group by Student and Course
-        groups = df.groupby(['student_id', 'course_name'])
+        # Group by Student and Course: baseline is the first attempt, current the last
+        # (after the sort above the groups are already in key order, so they are not re-sorted)
+        progress_df = df.groupby(['student_id', 'course_name'], sort=not presorted, observed=True).agg(
+            baseline_score=('score', 'first'),
+            current_score=('score', 'last'),
+            attempts_count=('score', 'size')
+        ).reset_index()
         
-        progress_data = []
+        progress_df = progress_df[progress_df['attempts_count'] > 1].reset_index(drop=True)
+        progress_df['improvement'] = progress_df['current_score'] - progress_df['baseline_score']
         
-        for (student_id, course_name), group in groups:
-            if len(group) > 1:
-                baseline = group.iloc[0]['score']
-                current = group.iloc[-1]['score']
-                improvement = current - baseline
-                
-                progress_data.append({
-                    'student_id': student_id,
-                    'course_name': course_name,
-                    'baseline_score': baseline,
-                    'current_score': current,
-                    'improvement': improvement,
-                    'attempts_count': len(group)
-                })
-        
-        return pd.DataFrame(progress_data)
+        return progress_df[['student_id', 'course_name', 'baseline_score', 'current_score', 'improvement', 'attempts_count']]
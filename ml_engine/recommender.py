@@ -1,35 +1,72 @@
 import pandas as pd
+import numpy as np
+
+# Weak subject keyword -> suggested courses (ANAR3: 10+ course catalog mapping)
+COURSE_CATALOG = {
+    'Python': ['Python Fundamentals', 'Data Structures in Python'],
+    'Java': ['Java Programming I', 'Object Oriented Programming'],
+    'SQL': ['Database Design', 'SQL Masterclass'],
+    'Data Science': ['Statistics for DS', 'Intro to ML'],
+    'Computer Networks': ['Networking Basics', 'TCP/IP Protocols'],
+    'Math': ['Linear Algebra', 'Calculus Refresher'],
+    'Web Development': ['HTML/CSS Bootcamp', 'JavaScript Essentials'],
+    'Algorithms': ['Algorithms I', 'Competitive Programming'],
+    'Operating Systems': ['OS Concepts', 'Linux Admin'],
+    'Security': ['Cybersecurity Basics', 'Ethical Hacking']
+}
 
 class CourseRecommender:
     def __init__(self, course_catalog=None):
-        self.course_catalog = course_catalog
+        # Defaults to the module-level catalog, built once at import
+        self.course_catalog = course_catalog if course_catalog is not None else COURSE_CATALOG
+
+    def recommend_courses(self, row):
+        """
+        Simple rule-based recommender for one summary row.
+        If performance is Poor, recommend remedial course.
+        """
+        if row['performance'] == 'Poor':
+            return f"Remedial: {row['course_name']} Refresher"
+        elif row['performance'] == 'Medium':
+            return f"Advanced: {row['course_name']} Plus"
+        else:
+            return "Mentorship Program (Become a Mentor)"
+
+    def recommend_courses_vectorized(self, df):
+        """
+        Same rule as recommend_courses, applied to the whole summary at once.
+        """
+        course = df['course_name'].astype(str)
+        missing = course.isna()
+        if missing.any():
+            # Spell missing courses as the per-row f-string does ('nan' / 'None')
+            course = course.where(~missing, df['course_name'][missing].astype(object).map(str))
+        actions = np.select(
+            [df['performance'] == 'Poor', df['performance'] == 'Medium'],
+            ['Remedial: ' + course + ' Refresher', 'Advanced: ' + course + ' Plus'],
+            default='Mentorship Program (Become a Mentor)'
+        )
+        return pd.Series(actions, index=df.index)
 
     def recommend_from_weaknesses(self, weaknesses):
         """
         Generate recommendations based on list of weak subjects.
         Satisfies ANAR3: 10+ course catalog mapping.
         """
-        catalog = {
-            'Python': ['Python Fundamentals', 'Data Structures in Python'],
-            'Java': ['Java Programming I', 'Object Oriented Programming'],
-            'SQL': ['Database Design', 'SQL Masterclass'],
-            'Data Science': ['Statistics for DS', 'Intro to ML'],
-            'Computer Networks': ['Networking Basics', 'TCP/IP Protocols'],
-            'Math': ['Linear Algebra', 'Calculus Refresher'],
-            'Web Development': ['HTML/CSS Bootcamp', 'JavaScript Essentials'],
-            'Algorithms': ['Algorithms I', 'Competitive Programming'],
-            'Operating Systems': ['OS Concepts', 'Linux Admin'],
-            'Security': ['Cybersecurity Basics', 'Ethical Hacking']
-        }
-        
+        catalog = self.course_catalog
         recommendations = []
+        seen = set()
         for subject in weaknesses:
             # Simple substring matching or direct lookup
-            matches = [courses for key, courses in catalog.items() if key in subject or subject in key]
-            for batch in matches:
-                recommendations.extend(batch)
+            for key, courses in catalog.items():
+                if key in subject or subject in key:
+                    # Skip duplicates as they are generated, keeping first-seen order
+                    for course in courses:
+                        if course not in seen:
+                            seen.add(course)
+                            recommendations.append(course)
                 
         if not recommendations and weaknesses:
             recommendations.append("General Study Skills Workshop")
             
-        return list(set(recommendations)) # Remove duplicates
+        return recommendations
@@ -0,0 +1,26 @@
+from functools import lru_cache
+
+# Canonical column -> alternative names seen in uploads, in order of preference
+COLUMN_ALIASES = {
+    'score': ['mark'],
+    'name': ['candidate_name', 'student_name'],
+    'course_name': ['course'],
+    'email': ['candidate_email'],
+}
+
+@lru_cache(maxsize=32)
+def resolve_rename_map(columns):
+    """
+    Rename map from an upload's standardized column names (a frozenset) onto the
+    canonical schema. Resolved once per distinct header; a canonical column that
+    is already present is never overwritten.
+    """
+    rename_map = {}
+    for target, aliases in COLUMN_ALIASES.items():
+        if target in columns:
+            continue
+        for alias in aliases:
+            if alias in columns:
+                rename_map[alias] = target
+                break
+    return rename_map
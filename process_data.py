@@ -2,11 +2,19 @@ import pandas as pd
 import numpy as np
 import os
 
-def load_data(file_path):
+from ml_engine.data_processor import LARGE_UPLOAD_BYTES, CHUNK_ROWS
+from ml_engine.performance_analyzer import PERFORMANCE_DTYPE
+from ml_engine.schema import resolve_rename_map
+
+def load_data(file_path, chunksize=None):
     """
     Loads data from a CSV or Excel file.
+    With chunksize, a CSV is cleaned chunk by chunk so the raw file is never
+    held in memory at once; the result is then already cleaned.
     """
     if file_path.endswith('.csv'):
+        if chunksize:
+            return pd.concat((clean_data(chunk) for chunk in pd.read_csv(file_path, chunksize=chunksize)), ignore_index=True)
         return pd.read_csv(file_path)
     elif file_path.endswith(('.xls', '.xlsx')):
         return pd.read_excel(file_path)
@@ -25,20 +33,15 @@ def clean_data(df):
     
     # Check for expected columns based on user's schema
     # candidate_scores.csv structure: student_id, name, email, course_id, course_name, attempt_id, score, etc.
-    if 'score' in df.columns:
-        # User data uses 'score'
-        pass 
-    elif 'mark' in df.columns:
-        # Fallback for old sample data
-        df.rename(columns={'mark': 'score'}, inplace=True)
-        
-    if 'student_name' in df.columns:
-         df.rename(columns={'student_name': 'name'}, inplace=True)
+    # Older sample data uses 'mark', 'student_name', 'course'; shared alias map with DataProcessor
+    df.rename(columns=resolve_rename_map(frozenset(df.columns)), inplace=True)
     
-    # Ensure Score is numeric
+    # Ensure Score is numeric (float32 is plenty for marks and halves the bytes each aggregation reads)
     if 'score' in df.columns:
-        df['score'] = pd.to_numeric(df['score'], errors='coerce')
-        df['score'].fillna(0, inplace=True) # Treat missing marks as 0
+        df['score'] = pd.to_numeric(df['score'], errors='coerce').fillna(0).astype(np.float32) # Treat missing marks as 0
+    # Numeric student ids fit a narrower integer type
+    if 'student_id' in df.columns and pd.api.types.is_integer_dtype(df['student_id']):
+        df['student_id'] = pd.to_numeric(df['student_id'], downcast='integer')
     
     return df
 
@@ -53,14 +56,25 @@ def categorize_performance(score):
     else:
         return 'High'
 
+def categorize_performance_batch(scores):
+    """
+    categorize_performance for a whole score column at once.
+    """
+    return np.select([scores < 60, scores <= 80], ['Poor', 'Medium'], default='High')
+
 def process_student_data(file_path, feedback_file_path=None):
     """
     Main function to process the student data file.
     Merged with feedback if provided.
     """
-    # Load Main Score Data
-    df = load_data(file_path)
-    df = clean_data(df)
+    # Load Main Score Data (large CSVs in chunks, same threshold as DataProcessor)
+    chunksize = None
+    if file_path.endswith('.csv') and os.path.getsize(file_path) > LARGE_UPLOAD_BYTES:
+        chunksize = CHUNK_ROWS
+    df = load_data(file_path, chunksize=chunksize)
+    if not chunksize:
+        # Chunked loads come back cleaned
+        df = clean_data(df)
     
     # Load Feedback Data if available
     if feedback_file_path and os.path.exists(feedback_file_path):
@@ -74,14 +88,10 @@ def process_student_data(file_path, feedback_file_path=None):
             # Check if feedback_df has 'feedback' column
             if 'feedback' in feedback_df.columns:
                 df = pd.merge(df, feedback_df[['student_id', 'feedback']], on='student_id', how='left')
-                df['feedback'].fillna("No feedback available.", inplace=True)
+                df['feedback'] = df['feedback'].fillna("No feedback available.")
     
     # Required columns check
     required_cols = ['student_id', 'name', 'course_name', 'score']
-    # Map from user specific columns if needed
-    if 'course' in df.columns and 'course_name' not in df.columns:
-        df.rename(columns={'course': 'course_name'}, inplace=True)
-        
     missing_cols = [col for col in required_cols if col not in df.columns]
     if missing_cols:
         raise ValueError(f"Missing required columns: {missing_cols}")
@@ -95,35 +105,28 @@ def process_student_data(file_path, feedback_file_path=None):
     
     # Calculate aggregation
     # Best score, Average score, Count attempts
-    agg_funcs = {'score': ['max', 'mean', 'count']}
+    aggregations = {
+        'best_score': ('score', 'max'),
+        'average_score': ('score', 'mean'),
+        'attempts': ('score', 'count'),
+    }
     
     # If we have feedback, we take the first one (assuming it's per student)
     if 'feedback' in df.columns:
-        agg_funcs['feedback'] = 'first'
+        aggregations['feedback'] = ('feedback', 'first')
     if 'topic_tags' in df.columns:
-         agg_funcs['topic_tags'] = 'first' # Take first available tags
+        aggregations['topic_tags'] = ('topic_tags', 'first') # Take first available tags
     
     # Perform aggregation
-    # This reduces multiple attempts to a single summary row per student per course
-    summary_df = df.groupby(group_cols).agg(agg_funcs).reset_index()
-    
-    # Flatten Hierarchical columns
-    summary_df.columns = ['_'.join(col).strip() if col[1] else col[0] for col in summary_df.columns.values]
-    
-    # Rename for clarity
-    summary_df.rename(columns={
-        'score_max': 'best_score',
-        'score_mean': 'average_score',
-        'score_count': 'attempts'
-    }, inplace=True)
-    
-    if 'feedback_first' in summary_df.columns:
-        summary_df.rename(columns={'feedback_first': 'feedback'}, inplace=True)
-    if 'topic_tags_first' in summary_df.columns:
-        summary_df.rename(columns={'topic_tags_first': 'topic_tags'}, inplace=True)
+    # This reduces multiple attempts to a single summary row per student per course;
+    # named aggregation yields the final flat column names directly
+    summary_df = df.groupby(group_cols).agg(**aggregations).reset_index()
 
     # Determine Performance Category based on Best Score
-    summary_df['performance'] = summary_df['best_score'].apply(categorize_performance)
+    summary_df['performance'] = categorize_performance_batch(summary_df['best_score'])
+    # Low-cardinality labels as categoricals: smaller columns, integer-code masks and groupby keys
+    summary_df['performance'] = summary_df['performance'].astype(PERFORMANCE_DTYPE)
+    summary_df['course_name'] = summary_df['course_name'].astype('category')
     
     # Save processed data
     output_path = 'processed_student_data.csv'
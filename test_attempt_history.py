@@ -0,0 +1,67 @@
+import io
+import os
+import tempfile
+
+# Run against a throwaway database and working directory so real data is untouched
+work_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(work_dir, 'performance.db')
+os.chdir(work_dir)
+
+from app import app
+from database.models import Attempt
+
+UNDATED_CSV = b"""student_id,name,email,course_name,score
+S001,Ann Lee,ann@example.com,Python Basics,40
+S001,Ann Lee,ann@example.com,Python Basics,55
+S002,Bob Ray,bob@example.com,Data Science,90
+"""
+
+# Ann's newest attempt has an unparseable date, so it is stored undated and counts as latest
+MIXED_CSV = b"""student_id,name,email,course_name,score,attempt_timestamp
+S001,Ann Lee,ann@example.com,Python Basics,40,2024-01-01
+S001,Ann Lee,ann@example.com,Python Basics,55,not a date
+S001,Ann Lee,ann@example.com,Python Basics,60,2024-03-01
+S002,Bob Ray,bob@example.com,Data Science,90,2024-02-01
+S002,Bob Ray,bob@example.com,Data Science,70,
+"""
+
+def upload(client, content, filename):
+    return client.post('/upload', data={'file': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data')
+
+print("Testing Attempt History...")
+
+client = app.test_client()
+client.post('/login', data={'email': 'admin@college.edu', 'password': 'admin123'})
+
+with app.app_context():
+    # 1. Upload without a timestamp column
+    print("[1] Uploading attempts without timestamps...")
+    upload(client, UNDATED_CSV, 'undated.csv')
+    attempts = Attempt.query.all()
+    print("Stored attempts:", len(attempts))
+    assert len(attempts) == 3, "Every uploaded attempt should be stored"
+    assert all(attempt.attempt_date is None for attempt in attempts), "Undated attempts should keep attempt_date NULL"
+    print("attempt_date is NULL for undated attempts.")
+
+    # 2. Edit targets the undated attempt among dated ones
+    print("\n[2] Editing a student with dated and undated attempts...")
+    upload(client, MIXED_CSV, 'mixed.csv')
+    undated = Attempt.query.filter(Attempt.attempt_date.is_(None)).order_by(Attempt.mark).all()
+    assert [attempt.mark for attempt in undated] == [55, 70], "Blank and unparseable dates should be stored as NULL"
+    page = client.get('/edit_student/ann@example.com').data.decode()
+    assert 'value="55.0"' in page and 'Unknown' in page, "Edit page should show the undated attempt as latest"
+    client.post('/edit_student/ann@example.com', data={'name': 'Ann Lee', 'score': '77'})
+    marks = sorted(attempt.mark for attempt in Attempt.query.filter(Attempt.attempt_date.isnot(None), Attempt.mark < 90))
+    assert marks == [40, 60], "Dated attempts should be left alone"
+    assert Attempt.query.filter(Attempt.mark == 77, Attempt.attempt_date.is_(None)).count() == 1, "The undated attempt should be updated"
+    print("Edit updated the undated (latest) attempt.")
+
+    # 3. Delete removes every attempt of the student, dated or not
+    print("\n[3] Deleting a student with dated and undated attempts...")
+    client.post('/delete_student/ann@example.com')
+    remaining = sorted(attempt.mark for attempt in Attempt.query.all())
+    assert remaining == [70, 90], "Only the other student's attempts should remain"
+    print("Delete removed all of the student's attempts.")
+
+print("\nAttempt History Test Complete.")
@@ -1,6 +1,5 @@
 import process_data
 import ml_analyzer
-import pandas as pd
 import os
 
 # Define paths
@@ -8,6 +7,8 @@ base_dir = r"c:\Users\kanth\AI-Powered Candidate Performance Analyzer Folder"
 scores_file = os.path.join(base_dir, "candidate_scores.csv")
 feedback_file = os.path.join(base_dir, "all_students_feedback.csv")
 
+VERBOSE = bool(os.environ.get('TEST_VERBOSE'))
+
 print(f"Testing with files:\nScores: {scores_file}\nFeedback: {feedback_file}")
 
 try:
@@ -16,16 +17,18 @@ try:
     df = process_data.process_student_data(scores_file, feedback_file)
     print("Data processed successfully.")
     print("Columns:", df.columns.tolist())
-    print("Head:\n", df.head())
+    if VERBOSE:
+        print("Head:\n", df.head())
     
     # 2. Run ML Analysis
     print("\nRunning ML Analysis...")
-    df['recommended_action'] = df.apply(ml_analyzer.recommend_courses, axis=1)
+    df['recommended_action'] = ml_analyzer.recommend_courses_vectorized(df)
     pairings = ml_analyzer.match_mentors(df)
     
     print("ML Analysis complete.")
-    print("Recommendations sample:\n", df[['name', 'recommended_action']].head())
-    print("Pairings sample:\n", pairings.head())
+    if VERBOSE:
+        print("Recommendations sample:\n", df[['name', 'recommended_action']].head())
+        print("Pairings sample:\n", pairings.head())
     
     # Check if feedback is present
     if 'feedback' in df.columns:
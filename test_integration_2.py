@@ -1,8 +1,6 @@
 import process_data
 import ml_analyzer
-import pandas as pd
 import os
-import shutil
 
 # Define paths
 base_dir = r"c:\Users\kanth\AI-Powered Candidate Performance Analyzer Folder"
@@ -10,6 +8,8 @@ scores_file = os.path.join(base_dir, "candidate_scores.csv")
 feedback_file = os.path.join(base_dir, "all_students_feedback.csv")
 pairings_file = os.path.join(base_dir, "pairings.csv")
 
+VERBOSE = bool(os.environ.get('TEST_VERBOSE'))
+
 # Create a simulated upload folder
 upload_dir = os.path.join(base_dir, "uploads_test")
 if not os.path.exists(upload_dir):
@@ -25,7 +25,7 @@ try:
     
     # 2. Add Recommendations
     print("\n[2] Generating Recommendations...")
-    df['recommended_action'] = df.apply(ml_analyzer.recommend_courses, axis=1)
+    df['recommended_action'] = ml_analyzer.recommend_courses_vectorized(df)
     
     # 3. Simulate Pairings File Upload Logic
     print("\n[3] Testing Pairings File Integration...")
@@ -52,7 +52,8 @@ try:
         current = set(pairings_df.columns)
         if required.issubset(current):
              print("SUCCESS: Pairings file has all required columns for dashboard.")
-             print(pairings_df.head(2))
+             if VERBOSE:
+                 print(pairings_df.head(2))
         else:
              print(f"FAILURE: Pairings file missing columns. Found: {current}, Expected: {required}")
     else: